@@ -9,6 +9,7 @@
 
 import sys
 import os
+import threading
 import traceback
 
 # ------------------------------------------------------------------
@@ -22,16 +23,10 @@ if PROJECT_ROOT not in sys.path:
 # ------------------------------------------------------------------
 # Импорты внутренних модулей
 # ------------------------------------------------------------------
+# Тяжелые модули (tkinter, qrcode) импортируются лениво внутри функций,
+# чтобы не замедлять холодный старт интерпретатора.
 
 from src.database import get_database
-from src.gui import ServiceCenterApp
-from src.login import LoginWindow
-from src.qr_generator import generate_qr
-from src.import_csv import (
-    import_users,
-    import_requests,
-    import_comments
-)
 
 # ------------------------------------------------------------------
 # Пути к данным
@@ -52,6 +47,12 @@ def import_initial_data():
     Импорт исходных данных из CSV-файлов.
     Выполняется безопасно (без дублирования данных).
     """
+    from src.import_csv import (
+        import_users,
+        import_requests,
+        import_comments
+    )
+
     try:
         if os.path.exists(USERS_CSV):
             import_users(USERS_CSV)
@@ -72,6 +73,19 @@ def import_initial_data():
 # Инициализация приложения
 # ------------------------------------------------------------------
 
+def _maybe_generate_qr():
+    """
+    Генерация QR-кода для оценки качества (если его еще нет).
+    """
+    try:
+        qr_path = os.path.join(PROJECT_ROOT, "quality_qr.png")
+        if not os.path.exists(qr_path):
+            from src.qr_generator import generate_qr
+            generate_qr(qr_path)
+    except Exception as e:
+        print("Не удалось сгенерировать QR-код:", e)
+
+
 def initialize_application():
     """
     Первичная инициализация:
@@ -85,13 +99,9 @@ def initialize_application():
     # Импорт CSV
     import_initial_data()
 
-    # Генерация QR-кода для оценки качества
-    try:
-        qr_path = os.path.join(PROJECT_ROOT, "quality_qr.png")
-        if not os.path.exists(qr_path):
-            generate_qr(qr_path)
-    except Exception as e:
-        print("Не удалось сгенерировать QR-код:", e)
+    # QR-код не нужен для входа — генерируем в фоне,
+    # чтобы не задерживать окно авторизации
+    threading.Thread(target=_maybe_generate_qr, daemon=True).start()
 
 
 # ------------------------------------------------------------------
@@ -103,6 +113,10 @@ def main():
     Главная функция запуска приложения.
     """
     try:
+        # GUI-модули подтягивают tkinter — грузим только здесь
+        from src.gui import ServiceCenterApp
+        from src.login import LoginWindow
+
         # Инициализация
         initialize_application()
 
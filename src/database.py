@@ -1,343 +1,822 @@
-"""
-Модуль для работы с базой данных SQLite.
-Реализует CRUD-операции и статистику для системы учета заявок.
-"""
-import os
-import sqlite3
-import logging
-from datetime import datetime
-from typing import List, Dict, Optional
-
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-class Database:
-    """
-    Класс управления базой данных заявок на ремонт.
-    """
-
-    def __init__(self, db_path: str = "data/service_center.db"):
-        self.db_path = db_path
-        self.connection: Optional[sqlite3.Connection] = None
-        self.cursor: Optional[sqlite3.Cursor] = None
-        self._initialize_database()
-
-    # =========================
-    # ИНИЦИАЛИЗАЦИЯ БАЗЫ ДАННЫХ
-    # =========================
-
-    def _initialize_database(self) -> None:
-        """
-        Создание структуры БД при первом запуске.
-        """
-        try:
-            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row
-            self.cursor = self.connection.cursor()
-
-            self.cursor.execute("PRAGMA foreign_keys = ON")
-
-            # ---------- ЗАЯВКИ ----------
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS requests (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created_date TEXT NOT NULL,
-                    device_type TEXT NOT NULL,
-                    device_model TEXT NOT NULL,
-                    problem_description TEXT NOT NULL,
-                    client_name TEXT NOT NULL,
-                    client_phone TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'Новая',
-                    master_name TEXT,
-                    deadline TEXT,
-                    completion_date TEXT,
-                    updated_date TEXT
-                )
-            """)
-
-            # ---------- КОММЕНТАРИИ ----------
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS comments (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    request_id INTEGER NOT NULL,
-                    comment_text TEXT NOT NULL,
-                    parts_ordered TEXT,
-                    added_date TEXT NOT NULL,
-                    author TEXT NOT NULL,
-                    FOREIGN KEY (request_id)
-                        REFERENCES requests(id)
-                        ON DELETE CASCADE
-                )
-            """)
-
-            # ---------- ПОЛЬЗОВАТЕЛИ ----------
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    role TEXT NOT NULL,
-                    full_name TEXT NOT NULL
-                )
-            """)
-
-            # ---------- ИНДЕКСЫ ----------
-            self.cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_requests_status ON requests(status)"
-            )
-            self.cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_requests_client ON requests(client_name)"
-            )
-
-            self.connection.commit()
-            logger.info("База данных успешно инициализирована")
-
-        except sqlite3.Error as e:
-            logger.error(f"Ошибка инициализации БД: {e}")
-            raise
-
-    # =========================
-    # CRUD ЗАЯВОК
-    # =========================
-
-    def add_request(
-        self,
-        device_type: str,
-        device_model: str,
-        problem_description: str,
-        client_name: str,
-        client_phone: str,
-        deadline: Optional[str] = None
-    ) -> int:
-        """
-        Добавление новой заявки.
-        """
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        try:
-            self.cursor.execute("""
-                INSERT INTO requests (
-                    created_date,
-                    device_type,
-                    device_model,
-                    problem_description,
-                    client_name,
-                    client_phone,
-                    status,
-                    deadline,
-                    updated_date
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                current_time,
-                device_type,
-                device_model,
-                problem_description,
-                client_name,
-                client_phone,
-                "Новая",
-                deadline,
-                current_time
-            ))
-
-            self.connection.commit()
-            request_id = self.cursor.lastrowid
-            logger.info(f"Создана заявка №{request_id}")
-            return request_id
-
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            logger.error(f"Ошибка добавления заявки: {e}")
-            raise
-
-    def get_all_requests(self, status_filter: Optional[str] = None) -> List[Dict]:
-        """
-        Получение списка заявок.
-        """
-        query = "SELECT * FROM requests"
-        params = []
-
-        if status_filter:
-            query += " WHERE status = ?"
-            params.append(status_filter)
-
-        query += " ORDER BY created_date DESC"
-
-        self.cursor.execute(query, params)
-        return [dict(row) for row in self.cursor.fetchall()]
-
-    def update_request_status(
-        self,
-        request_id: int,
-        new_status: str,
-        master_name: Optional[str] = None
-    ) -> bool:
-        """
-        Изменение статуса заявки.
-        """
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        fields = ["status = ?", "updated_date = ?"]
-        params = [new_status, current_time]
-
-        if new_status in ("Готова к выдаче", "Завершена"):
-            fields.append("completion_date = ?")
-            params.append(current_time)
-
-        if master_name:
-            fields.append("master_name = ?")
-            params.append(master_name)
-
-        params.append(request_id)
-
-        query = f"UPDATE requests SET {', '.join(fields)} WHERE id = ?"
-
-        self.cursor.execute(query, params)
-        self.connection.commit()
-
-        return self.cursor.rowcount > 0
-
-    def extend_deadline(self, request_id: int, new_deadline: str) -> bool:
-        """
-        Продление срока выполнения заявки (роль менеджера).
-        """
-        try:
-            self.cursor.execute("""
-                UPDATE requests
-                SET deadline = ?, updated_date = ?
-                WHERE id = ?
-            """, (
-                new_deadline,
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                request_id
-            ))
-            self.connection.commit()
-            return self.cursor.rowcount > 0
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            logger.error(e)
-            return False
-
-    # =========================
-    # КОММЕНТАРИИ
-    # =========================
-
-    def add_comment(
-        self,
-        request_id: int,
-        comment_text: str,
-        parts_ordered: str,
-        author: str
-    ) -> bool:
-        """
-        Добавление комментария к заявке.
-        """
-        try:
-            self.cursor.execute("""
-                INSERT INTO comments (
-                    request_id,
-                    comment_text,
-                    parts_ordered,
-                    added_date,
-                    author
-                )
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                request_id,
-                comment_text,
-                parts_ordered,
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                author
-            ))
-            self.connection.commit()
-            return True
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            logger.error(e)
-            return False
-
-    # =========================
-    # ПОИСК
-    # =========================
-
-    def search_requests(self, search_term: str) -> List[Dict]:
-        """
-        Поиск заявок по ID, клиенту, телефону или модели.
-        """
-        pattern = f"%{search_term}%"
-        self.cursor.execute("""
-            SELECT * FROM requests
-            WHERE
-                CAST(id AS TEXT) LIKE ?
-                OR client_name LIKE ?
-                OR client_phone LIKE ?
-                OR device_model LIKE ?
-            ORDER BY created_date DESC
-        """, (pattern, pattern, pattern, pattern))
-
-        return [dict(row) for row in self.cursor.fetchall()]
-
-    # =========================
-    # СТАТИСТИКА
-    # =========================
-
-    def get_request_statistics(self) -> Dict:
-        """
-        Получение сводной статистики.
-        """
-        stats = {}
-
-        self.cursor.execute("SELECT COUNT(*) FROM requests")
-        stats["total_requests"] = self.cursor.fetchone()[0]
-
-        self.cursor.execute("""
-            SELECT status, COUNT(*) FROM requests GROUP BY status
-        """)
-        stats["status_counts"] = dict(self.cursor.fetchall())
-
-        self.cursor.execute("""
-            SELECT AVG(
-                (julianday(completion_date) - julianday(created_date)) * 24
-            )
-            FROM requests
-            WHERE completion_date IS NOT NULL
-        """)
-        avg = self.cursor.fetchone()[0]
-        stats["average_completion_hours"] = round(avg, 2) if avg else 0
-
-        self.cursor.execute("""
-            SELECT device_type, COUNT(*) FROM requests GROUP BY device_type
-        """)
-        stats["device_statistics"] = dict(self.cursor.fetchall())
-
-        return stats
-
-    # =========================
-    # ЗАКРЫТИЕ
-    # =========================
-
-    def close(self) -> None:
-        if self.connection:
-            self.connection.close()
-            logger.info("Соединение с БД закрыто")
-
-
-# =========================
-# СИНГЛТОН
-# =========================
-
-_db_instance: Optional[Database] = None
-
-
-def get_database() -> Database:
-    """
-    Получение экземпляра БД (singleton).
-    """
-    global _db_instance
-    if _db_instance is None:
-        _db_instance = Database()
-    return _db_instance
+"""
+Модуль для работы с базой данных SQLite.
+Реализует CRUD-операции и статистику для системы учета заявок.
+"""
+import os
+import sqlite3
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, Optional
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Числовые коды статусов: сравнение и индексация идут по INTEGER
+# вместо побайтового сравнения UTF-8-строк
+_STATUS_ID = {
+    "Новая": 1,
+    "В процессе": 2,
+    "Ожидание запчастей": 3,
+    "Готова к выдаче": 4,
+    "Завершена": 5,
+}
+
+
+def _now_str() -> str:
+    """
+    Текущее время в формате БД.
+    time.strftime работает на уровне C — без создания объекта datetime.
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# SQL горячих операций — константы уровня модуля: текст не собирается
+# заново при каждом вызове, кэш подготовленных запросов sqlite3
+# попадает по нему без повторной компиляции
+_INSERT_REQUEST_SQL = """
+    INSERT INTO requests (
+        created_date,
+        device_type,
+        device_model,
+        problem_description,
+        client_name,
+        client_phone,
+        status,
+        deadline,
+        updated_date
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@lru_cache(maxsize=32)
+def _update_request_sql(fields: tuple) -> str:
+    """
+    Текст UPDATE для заданного набора полей (мемоизируется:
+    вариантов набора немного, а собирается строка лишь однажды).
+    """
+    return f"UPDATE requests SET {', '.join(fields)} WHERE id = ?"
+
+
+class Database:
+    """
+    Класс управления базой данных заявок на ремонт.
+    """
+
+    def __init__(self, db_path: str = "data/service_center.db"):
+        self.db_path = db_path
+        # У каждого потока свое соединение: sqlite3.Connection
+        # небезопасно делить между GUI и фоновыми потоками
+        self._local = threading.local()
+        # Счетчик поколений данных: растет при каждой записи,
+        # кэши статистики сбрасываются по его изменению
+        self._version = 0
+        # Кэш списков заявок: (фильтр, поколение) -> строки
+        self._requests_cache = {}
+        # Кэш сводной статистики: поколение -> словарь
+        self._statistics_cache = {}
+        # Кэш результатов поиска: запрос -> строки
+        # (сбрасывается при смене поколения данных)
+        self._search_cache = {}
+        self._search_version = 0
+        self._initialize_database()
+
+    @property
+    def version(self) -> int:
+        """
+        Текущее поколение данных (для инвалидации кэшей).
+        """
+        return self._version
+
+    def _bump_version(self) -> None:
+        self._version += 1
+
+    # =========================
+    # СОЕДИНЕНИЯ ПО ПОТОКАМ
+    # =========================
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        Соединение текущего потока (создается при первом обращении).
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self._create_connection()
+            self._local.connection = conn
+            self._local.cursor = conn.cursor()
+        return conn
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """
+        Курсор текущего потока.
+        """
+        self.connection  # гарантирует создание соединения
+        return self._local.cursor
+
+    @contextmanager
+    def transaction(self):
+        """
+        Явная транзакция: BEGIN IMMEDIATE ... COMMIT.
+        Группирует несколько записей под один fsync.
+        """
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.cursor
+        except Exception:
+            self.connection.rollback()
+            raise
+        else:
+            self.connection.commit()
+            self._bump_version()
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """
+        Новое соединение с настроенными PRAGMA.
+        """
+        # Увеличенный кэш подготовленных запросов: повторные execute()
+        # с тем же SQL не проходят компиляцию заново.
+        # isolation_level=None: транзакциями управляем явно,
+        # одиночные записи идут в режиме autocommit без лишнего BEGIN
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        # Настройки производительности:
+        # WAL убирает блокировку читателей при записи,
+        # synchronous=NORMAL экономит один fsync на каждый commit
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -20000")
+        conn.execute("PRAGMA mmap_size = 268435456")
+
+        return conn
+
+    # =========================
+    # ИНИЦИАЛИЗАЦИЯ БАЗЫ ДАННЫХ
+    # =========================
+
+    def _initialize_database(self) -> None:
+        """
+        Создание структуры БД при первом запуске.
+        """
+        try:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+
+            # ---------- ЗАЯВКИ ----------
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS requests (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_date TEXT NOT NULL,
+                    device_type TEXT NOT NULL,
+                    device_model TEXT NOT NULL,
+                    problem_description TEXT NOT NULL,
+                    client_name TEXT NOT NULL,
+                    client_phone TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'Новая',
+                    master_name TEXT,
+                    deadline TEXT,
+                    completion_date TEXT,
+                    updated_date TEXT,
+                    created_ts INTEGER,
+                    completion_ts INTEGER,
+                    status_id INTEGER
+                )
+            """)
+
+            # Миграция старых БД: добавляем числовые метки времени
+            # и числовой код статуса
+            self.cursor.execute("PRAGMA table_info(requests)")
+            existing_columns = {row[1] for row in self.cursor.fetchall()}
+
+            for int_column in ("created_ts", "completion_ts", "status_id"):
+                if int_column not in existing_columns:
+                    self.cursor.execute(
+                        f"ALTER TABLE requests ADD COLUMN {int_column} INTEGER"
+                    )
+
+            # Заполняем метки для уже существующих строк
+            self.cursor.execute("""
+                UPDATE requests
+                SET created_ts = strftime('%s', created_date),
+                    completion_ts = strftime('%s', completion_date)
+                WHERE created_ts IS NULL
+            """)
+
+            # Триггеры поддерживают метки в актуальном состоянии,
+            # чтобы статистика считалась целочисленной арифметикой
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_requests_ts_insert
+                AFTER INSERT ON requests
+                BEGIN
+                    UPDATE requests
+                    SET created_ts = strftime('%s', NEW.created_date),
+                        completion_ts = strftime('%s', NEW.completion_date)
+                    WHERE id = NEW.id;
+                END
+            """)
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_requests_ts_update
+                AFTER UPDATE OF created_date, completion_date ON requests
+                BEGIN
+                    UPDATE requests
+                    SET created_ts = strftime('%s', NEW.created_date),
+                        completion_ts = strftime('%s', NEW.completion_date)
+                    WHERE id = NEW.id;
+                END
+            """)
+
+            # ---------- СПРАВОЧНИК СТАТУСОВ ----------
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS statuses (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL
+                )
+            """)
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO statuses (id, name) VALUES (?, ?)",
+                [(sid, name) for name, sid in _STATUS_ID.items()]
+            )
+
+            # Триггеры держат числовой код в актуальном состоянии;
+            # неизвестные статусы оставляют NULL, строка остается
+            # источником истины
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_requests_status_insert
+                AFTER INSERT ON requests
+                BEGIN
+                    UPDATE requests
+                    SET status_id = (
+                        SELECT id FROM statuses WHERE name = NEW.status
+                    )
+                    WHERE id = NEW.id;
+                END
+            """)
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_requests_status_update
+                AFTER UPDATE OF status ON requests
+                BEGIN
+                    UPDATE requests
+                    SET status_id = (
+                        SELECT id FROM statuses WHERE name = NEW.status
+                    )
+                    WHERE id = NEW.id;
+                END
+            """)
+
+            # Заполняем коды для уже существующих строк
+            self.cursor.execute("""
+                UPDATE requests
+                SET status_id = (
+                    SELECT id FROM statuses WHERE name = status
+                )
+                WHERE status_id IS NULL
+            """)
+
+            # ---------- КОММЕНТАРИИ ----------
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS comments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    request_id INTEGER NOT NULL,
+                    comment_text TEXT NOT NULL,
+                    parts_ordered TEXT,
+                    added_date TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    parts_cost INTEGER GENERATED ALWAYS
+                        AS (LENGTH(parts_ordered) * 10) STORED,
+                    FOREIGN KEY (request_id)
+                        REFERENCES requests(id)
+                        ON DELETE CASCADE
+                )
+            """)
+
+            # Миграция старых БД: ALTER TABLE умеет добавлять
+            # только VIRTUAL-вычисляемые столбцы
+            # (table_xinfo показывает и вычисляемые столбцы)
+            self.cursor.execute("PRAGMA table_xinfo(comments)")
+            comment_columns = {row[1] for row in self.cursor.fetchall()}
+
+            if "parts_cost" not in comment_columns:
+                self.cursor.execute("""
+                    ALTER TABLE comments ADD COLUMN parts_cost INTEGER
+                    GENERATED ALWAYS AS (LENGTH(parts_ordered) * 10) VIRTUAL
+                """)
+
+            # ---------- ПОЛЬЗОВАТЕЛИ ----------
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    full_name TEXT NOT NULL
+                )
+            """)
+
+            # ---------- ПОЛНОТЕКСТОВЫЙ ПОИСК ----------
+            # FTS5 — инвертированный индекс: поиск стоит O(совпадений),
+            # а не O(строк), в отличие от LIKE '%...%'
+            self.cursor.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type = 'table' AND name = 'requests_fts'
+            """)
+            fts_exists = self.cursor.fetchone() is not None
+
+            self.cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS requests_fts USING fts5(
+                    client_name,
+                    client_phone,
+                    device_model,
+                    content='requests',
+                    content_rowid='id'
+                )
+            """)
+
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_requests_fts_insert
+                AFTER INSERT ON requests
+                BEGIN
+                    INSERT INTO requests_fts(
+                        rowid, client_name, client_phone, device_model
+                    )
+                    VALUES (
+                        NEW.id, NEW.client_name,
+                        NEW.client_phone, NEW.device_model
+                    );
+                END
+            """)
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_requests_fts_delete
+                AFTER DELETE ON requests
+                BEGIN
+                    INSERT INTO requests_fts(
+                        requests_fts, rowid,
+                        client_name, client_phone, device_model
+                    )
+                    VALUES (
+                        'delete', OLD.id, OLD.client_name,
+                        OLD.client_phone, OLD.device_model
+                    );
+                END
+            """)
+            self.cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_requests_fts_update
+                AFTER UPDATE OF client_name, client_phone, device_model
+                ON requests
+                BEGIN
+                    INSERT INTO requests_fts(
+                        requests_fts, rowid,
+                        client_name, client_phone, device_model
+                    )
+                    VALUES (
+                        'delete', OLD.id, OLD.client_name,
+                        OLD.client_phone, OLD.device_model
+                    );
+                    INSERT INTO requests_fts(
+                        rowid, client_name, client_phone, device_model
+                    )
+                    VALUES (
+                        NEW.id, NEW.client_name,
+                        NEW.client_phone, NEW.device_model
+                    );
+                END
+            """)
+
+            # Индексируем уже существующие строки один раз при создании
+            if not fts_exists:
+                self.cursor.execute("""
+                    INSERT INTO requests_fts(requests_fts) VALUES('rebuild')
+                """)
+
+            # ---------- ИНДЕКСЫ ----------
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_requests_status ON requests(status)"
+            )
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_requests_client ON requests(client_name)"
+            )
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_requests_created ON requests(created_date)"
+            )
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_requests_device_status
+                ON requests(device_type, status)
+            """)
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_requests_completion
+                ON requests(completion_date)
+                WHERE completion_date IS NOT NULL
+            """)
+            # Индекс по числовому коду статуса: выборки и фильтры
+            # по статусу сравнивают INTEGER вместо UTF-8-строк
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_requests_status_device
+                ON requests(status_id, device_type)
+            """)
+
+            self.connection.commit()
+            logger.info("База данных успешно инициализирована")
+
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка инициализации БД: {e}")
+            raise
+
+    # =========================
+    # CRUD ЗАЯВОК
+    # =========================
+
+    def add_request(
+        self,
+        device_type: str,
+        device_model: str,
+        problem_description: str,
+        client_name: str,
+        client_phone: str,
+        deadline: Optional[str] = None
+    ) -> int:
+        """
+        Добавление новой заявки.
+        """
+        current_time = _now_str()
+
+        try:
+            self.cursor.execute(_INSERT_REQUEST_SQL, (
+                current_time,
+                device_type,
+                device_model,
+                problem_description,
+                client_name,
+                client_phone,
+                "Новая",
+                deadline,
+                current_time
+            ))
+
+            self.connection.commit()
+            self._bump_version()
+            request_id = self.cursor.lastrowid
+            logger.info(f"Создана заявка №{request_id}")
+            return request_id
+
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            logger.error(f"Ошибка добавления заявки: {e}")
+            raise
+
+    def add_requests_bulk(self, rows: List[tuple]) -> int:
+        """
+        Массовое добавление заявок одной транзакцией.
+
+        rows — кортежи (device_type, device_model, problem_description,
+        client_name, client_phone, deadline).
+        """
+        current_time = _now_str()
+
+        try:
+            # Один commit (и один fsync) на всю партию вместо commit на строку
+            with self.transaction():
+                self.cursor.executemany("""
+                    INSERT INTO requests (
+                        created_date,
+                        device_type,
+                        device_model,
+                        problem_description,
+                        client_name,
+                        client_phone,
+                        status,
+                        deadline,
+                        updated_date
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, 'Новая', ?, ?)
+                """, (
+                    (current_time, *row, current_time)
+                    for row in rows
+                ))
+
+            self._bump_version()
+            count = len(rows)
+            logger.info(f"Массово добавлено заявок: {count}")
+            return count
+
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка массового добавления заявок: {e}")
+            raise
+
+    def add_comments_bulk(self, rows: List[tuple]) -> int:
+        """
+        Массовое добавление комментариев одной транзакцией.
+
+        rows — кортежи (request_id, comment_text, parts_ordered, author).
+        """
+        current_time = _now_str()
+
+        try:
+            with self.transaction():
+                self.cursor.executemany("""
+                    INSERT INTO comments (
+                        request_id,
+                        comment_text,
+                        parts_ordered,
+                        added_date,
+                        author
+                    )
+                    VALUES (?, ?, ?, ?, ?)
+                """, (
+                    (row[0], row[1], row[2], current_time, row[3])
+                    for row in rows
+                ))
+
+            self._bump_version()
+            return len(rows)
+
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка массового добавления комментариев: {e}")
+            raise
+
+    def get_all_requests(self, status_filter: Optional[str] = None) -> List[Dict]:
+        """
+        Получение списка заявок.
+
+        Результат кэшируется до следующей записи в БД, поэтому
+        повторные обновления GUI не перечитывают таблицу.
+        """
+        key = (status_filter, self._version)
+        cached = self._requests_cache.get(key)
+        if cached is not None:
+            return cached
+
+        query = "SELECT * FROM requests"
+        params = []
+
+        if status_filter:
+            query += " WHERE status = ?"
+            params.append(status_filter)
+
+        query += " ORDER BY created_date DESC"
+
+        rows = self._fetch_dicts(query, params)
+
+        # Храним только актуальное поколение данных
+        self._requests_cache = {key: rows}
+        return rows
+
+    def get_request_by_id(self, request_id: int) -> Optional[Dict]:
+        """
+        Получение одной заявки по ID (точечное обновление в GUI).
+        """
+        rows = self._fetch_dicts(
+            "SELECT * FROM requests WHERE id = ?", (request_id,)
+        )
+        return rows[0] if rows else None
+
+    def _fetch_dicts(self, query: str, params=()) -> List[Dict]:
+        """
+        Выполнение запроса с материализацией строк в словари.
+
+        Обычные кортежи + dict(zip(...)) быстрее, чем
+        преобразование sqlite3.Row через __getitem__.
+        """
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+
+        columns = [d[0] for d in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def update_request_status(
+        self,
+        request_id: int,
+        new_status: str,
+        master_name: Optional[str] = None
+    ) -> bool:
+        """
+        Изменение статуса заявки.
+        """
+        current_time = _now_str()
+
+        fields = ["status = ?", "updated_date = ?"]
+        params = [new_status, current_time]
+
+        if new_status in ("Готова к выдаче", "Завершена"):
+            fields.append("completion_date = ?")
+            params.append(current_time)
+
+        if master_name:
+            fields.append("master_name = ?")
+            params.append(master_name)
+
+        params.append(request_id)
+
+        query = _update_request_sql(tuple(fields))
+
+        self.cursor.execute(query, params)
+        self.connection.commit()
+        self._bump_version()
+
+        return self.cursor.rowcount > 0
+
+    def delete_request(self, request_id: int) -> bool:
+        """
+        Удаление заявки (комментарии удаляются каскадно).
+        """
+        try:
+            self.cursor.execute(
+                "DELETE FROM requests WHERE id = ?", (request_id,)
+            )
+            self._bump_version()
+            return self.cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(e)
+            return False
+
+    def extend_deadline(self, request_id: int, new_deadline: str) -> bool:
+        """
+        Продление срока выполнения заявки (роль менеджера).
+        """
+        try:
+            self.cursor.execute("""
+                UPDATE requests
+                SET deadline = ?, updated_date = ?
+                WHERE id = ?
+            """, (
+                new_deadline,
+                _now_str(),
+                request_id
+            ))
+            self.connection.commit()
+            self._bump_version()
+            return self.cursor.rowcount > 0
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            logger.error(e)
+            return False
+
+    # =========================
+    # КОММЕНТАРИИ
+    # =========================
+
+    def add_comment(
+        self,
+        request_id: int,
+        comment_text: str,
+        parts_ordered: str,
+        author: str
+    ) -> bool:
+        """
+        Добавление комментария к заявке.
+        """
+        try:
+            self.cursor.execute("""
+                INSERT INTO comments (
+                    request_id,
+                    comment_text,
+                    parts_ordered,
+                    added_date,
+                    author
+                )
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                request_id,
+                comment_text,
+                parts_ordered,
+                _now_str(),
+                author
+            ))
+            self.connection.commit()
+            self._bump_version()
+            return True
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            logger.error(e)
+            return False
+
+    # =========================
+    # ПОИСК
+    # =========================
+
+    def search_requests(self, search_term: str) -> List[Dict]:
+        """
+        Поиск заявок по ID, клиенту, телефону или модели.
+
+        Текстовый поиск идет через FTS5-индекс (префиксное совпадение),
+        поиск по номеру заявки — по первичному ключу.
+
+        Повторные запросы с тем же термином до следующей записи в БД
+        отдаются из кэша (живой поиск шлет одни и те же префиксы).
+        """
+        if self._search_version != self._version:
+            self._search_cache.clear()
+            self._search_version = self._version
+
+        cached = self._search_cache.get(search_term)
+        if cached is not None:
+            return cached
+
+        # Экранируем кавычки и ищем по префиксу: "термин"*
+        match_expr = '"' + search_term.replace('"', '""') + '"*'
+
+        results = self._fetch_dicts("""
+            SELECT * FROM requests
+            WHERE
+                id IN (
+                    SELECT rowid FROM requests_fts
+                    WHERE requests_fts MATCH ?
+                )
+                OR CAST(id AS TEXT) LIKE ?
+            ORDER BY created_date DESC
+        """, (match_expr, f"%{search_term}%"))
+
+        # Ограничиваем размер кэша, чтобы редкие термины не копились
+        if len(self._search_cache) >= 128:
+            self._search_cache.clear()
+        self._search_cache[search_term] = results
+
+        return results
+
+    # =========================
+    # СТАТИСТИКА
+    # =========================
+
+    def get_request_statistics(self) -> Dict:
+        """
+        Получение сводной статистики.
+
+        Результат кэшируется до следующей записи в БД —
+        тот же механизм поколений, что у get_all_requests.
+        """
+        cached = self._statistics_cache.get(self._version)
+        if cached is not None:
+            return cached
+
+        stats = {}
+
+        self.cursor.execute("SELECT COUNT(*) FROM requests")
+        stats["total_requests"] = self.cursor.fetchone()[0]
+
+        self.cursor.execute("""
+            SELECT status, COUNT(*) FROM requests GROUP BY status
+        """)
+        stats["status_counts"] = dict(self.cursor.fetchall())
+
+        self.cursor.execute("""
+            SELECT AVG((completion_ts - created_ts) / 3600.0)
+            FROM requests
+            WHERE completion_ts IS NOT NULL
+        """)
+        avg = self.cursor.fetchone()[0]
+        stats["average_completion_hours"] = round(avg, 2) if avg else 0
+
+        self.cursor.execute("""
+            SELECT device_type, COUNT(*) FROM requests GROUP BY device_type
+        """)
+        stats["device_statistics"] = dict(self.cursor.fetchall())
+
+        # Храним только актуальное поколение данных
+        self._statistics_cache = {self._version: stats}
+        return stats
+
+    # =========================
+    # ЗАКРЫТИЕ
+    # =========================
+
+    def close(self) -> None:
+        """
+        Закрытие соединения текущего потока.
+        """
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
+            self._local.cursor = None
+            logger.info("Соединение с БД закрыто")
+
+
+# =========================
+# СИНГЛТОН
+# =========================
+
+_db_instance: Optional[Database] = None
+
+
+def get_database() -> Database:
+    """
+    Получение экземпляра БД (singleton).
+    """
+    global _db_instance
+    if _db_instance is None:
+        _db_instance = Database()
+    return _db_instance
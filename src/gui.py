@@ -3,8 +3,10 @@ GUI системы учета заявок на ремонт бытовой те
 Поддерживает роли пользователей и авторизацию.
 """
 
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext, simpledialog
+from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import logging
 
@@ -21,6 +23,11 @@ class ServiceCenterApp(tk.Tk):
     Главное окно приложения.
     """
 
+    # Виртуализация таблицы: в Treeview одновременно находится
+    # не больше _WINDOW строк, окно сдвигается при прокрутке
+    _WINDOW = 200
+    _SHIFT = 100
+
     def __init__(self):
         super().__init__()
 
@@ -31,6 +38,31 @@ class ServiceCenterApp(tk.Tk):
         self.db = get_database()
         self.current_user = None
 
+        # Кэш отображаемых заявок по id — детали открываются
+        # без повторного чтения всей таблицы
+        self._requests_by_id = {}
+
+        # Последние отправленные в Treeview значения строк:
+        # при обновлении трогаем только изменившиеся строки
+        self._row_cache = {}
+
+        # Полный список заявок и начало отрисованного окна
+        self._all_requests = []
+        self._window_start = 0
+
+        # Отложенный вызов поиска (дебаунс по клавиатуре)
+        self._search_after = None
+
+        # Пул потоков для тяжелого ввода-вывода (импорт CSV):
+        # главный цикл Tk не блокируется на чтении файлов
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+        # Диалоги создаются один раз и переиспользуются
+        # через withdraw()/deiconify() — без пересборки виджетов
+        self._add_dialog = None
+        self._status_dialog = None
+        self._comment_dialog = None
+
         self._setup_styles()
         self._create_widgets()
         self._center_window()
@@ -119,6 +151,10 @@ class ServiceCenterApp(tk.Tk):
             frame, text="Статистика", command=self._show_statistics
         ).pack(side=tk.LEFT, padx=5)
 
+        ttk.Button(
+            frame, text="Импорт CSV", command=self._import_csv
+        ).pack(side=tk.LEFT, padx=5)
+
         self.extend_button = ttk.Button(
             frame, text="Продлить срок (менеджер)", command=self._extend_deadline
         )
@@ -129,6 +165,9 @@ class ServiceCenterApp(tk.Tk):
         entry = ttk.Entry(frame, textvariable=self.search_var, width=25)
         entry.pack(side=tk.RIGHT)
         entry.bind("<Return>", lambda _: self._search())
+        # Живой поиск с дебаунсом: запрос уходит после паузы в наборе,
+        # а не на каждое нажатие клавиши
+        entry.bind("<KeyRelease>", self._on_search_key)
 
     def _create_table(self, parent):
         frame = ttk.Frame(parent)
@@ -147,11 +186,11 @@ class ServiceCenterApp(tk.Tk):
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.tree.bind("<Double-1>", self._show_details)
 
-        scrollbar = ttk.Scrollbar(
+        self.scrollbar = ttk.Scrollbar(
             frame, orient=tk.VERTICAL, command=self.tree.yview
         )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
 
     def _create_details(self, parent):
         frame = ttk.LabelFrame(parent, text="Детали заявки", padding=10)
@@ -188,27 +227,134 @@ class ServiceCenterApp(tk.Tk):
     # ЛОГИКА
     # =========================
 
-    def _load_requests(self):
-        self.tree.delete(*self.tree.get_children())
-        requests = self.db.get_all_requests()
+    @staticmethod
+    def _row_values(r) -> tuple:
+        return (
+            r["id"],
+            r["created_date"][:19],
+            r["device_type"],
+            r["device_model"],
+            r["client_name"],
+            r["status"],
+            r["master_name"] or "-",
+            r["deadline"] or "-"
+        )
+
+    def _render_rows(self, requests):
+        """
+        Инкрементальное обновление таблицы: удаляем, вставляем и
+        перерисовываем только строки, которые реально изменились,
+        вместо полной очистки и повторной вставки.
+        """
+        new_values = {r["id"]: self._row_values(r) for r in requests}
+
+        # Исчезнувшие строки
+        for rid in set(self._row_cache) - set(new_values):
+            self.tree.delete(rid)
+            del self._row_cache[rid]
+
+        for index, r in enumerate(requests):
+            rid = r["id"]
+            values = new_values[rid]
+
+            if rid not in self._row_cache:
+                self.tree.insert("", index, iid=rid, values=values)
+            else:
+                if self._row_cache[rid] != values:
+                    self.tree.item(str(rid), values=values)
+                if self.tree.index(str(rid)) != index:
+                    self.tree.move(str(rid), "", index)
+
+            self._row_cache[rid] = values
+
+    def _render_window(self):
+        """
+        Отрисовка текущего окна виртуализированной таблицы.
+        """
+        start = self._window_start
+        self._render_rows(self._all_requests[start:start + self._WINDOW])
 
-        for r in requests:
-            self.tree.insert(
-                "", tk.END, iid=r["id"],
-                values=(
-                    r["id"],
-                    r["created_date"][:19],
-                    r["device_type"],
-                    r["device_model"],
-                    r["client_name"],
-                    r["status"],
-                    r["master_name"] or "-",
-                    r["deadline"] or "-"
-                )
+    def _on_tree_scroll(self, first, last):
+        """
+        Прокрутка с виртуализацией: при достижении края окна
+        подгружаем следующую порцию строк вместо того,
+        чтобы держать в виджете всю таблицу.
+        """
+        self.scrollbar.set(first, last)
+
+        first = float(first)
+        last = float(last)
+        total = len(self._all_requests)
+
+        if total <= self._WINDOW:
+            return
+
+        if last >= 1.0 and self._window_start + self._WINDOW < total:
+            # Дошли до низа окна — сдвигаем его вперед
+            self._window_start = min(
+                self._window_start + self._SHIFT, total - self._WINDOW
             )
+            self._render_window()
+            self.tree.yview_moveto(
+                max(0.0, first - self._SHIFT / self._WINDOW)
+            )
+        elif first <= 0.0 and self._window_start > 0:
+            # Дошли до верха окна — сдвигаем его назад
+            previous_start = self._window_start
+            self._window_start = max(0, self._window_start - self._SHIFT)
+            moved = previous_start - self._window_start
+            self._render_window()
+            self.tree.yview_moveto(first + moved / self._WINDOW)
+
+    def _show_requests(self, requests):
+        """
+        Замена отображаемого набора заявок (с начала списка).
+        """
+        self._all_requests = requests
+        self._window_start = 0
+        self._requests_by_id = {r["id"]: r for r in requests}
+        self._render_window()
+
+    def _load_requests(self):
+        requests = self.db.get_all_requests()
+        self._show_requests(requests)
 
         self.status_bar.config(text=f"Загружено заявок: {len(requests)}")
 
+    def _refresh_request(self, rid: int):
+        """
+        Точечное обновление одной заявки: перечитываем только ее строку
+        и перерисовываем таблицу инкрементально, без полной перезагрузки.
+        """
+        req = self.db.get_request_by_id(rid)
+        if req is None:
+            self._load_requests()
+            return
+
+        self._requests_by_id[rid] = req
+        for index, r in enumerate(self._all_requests):
+            if r["id"] == rid:
+                self._all_requests[index] = req
+                break
+        self._render_window()
+
+    def _remove_request_row(self, rid: int):
+        """
+        Локальное удаление строки из отображаемого набора.
+        """
+        self._requests_by_id.pop(rid, None)
+        self._all_requests = [
+            r for r in self._all_requests if r["id"] != rid
+        ]
+        if self._window_start >= len(self._all_requests):
+            self._window_start = max(
+                0, len(self._all_requests) - self._WINDOW
+            )
+        self._render_window()
+        self.status_bar.config(
+            text=f"Загружено заявок: {len(self._all_requests)}"
+        )
+
     def _get_selected_id(self) -> Optional[int]:
         sel = self.tree.selection()
         return int(sel[0]) if sel else None
@@ -218,7 +364,14 @@ class ServiceCenterApp(tk.Tk):
         if not rid:
             return
 
-        req = next(r for r in self.db.get_all_requests() if r["id"] == rid)
+        req = self._requests_by_id.get(rid)
+        if req is None:
+            # Промах кэша — точечный запрос вместо полной перезагрузки
+            found = self.db.search_requests(str(rid))
+            req = next((r for r in found if r["id"] == rid), None)
+            if req is None:
+                return
+            self._requests_by_id[rid] = req
 
         text = (
             f"Заявка №{req['id']}\n"
@@ -241,10 +394,10 @@ class ServiceCenterApp(tk.Tk):
     # =========================
 
     def _add_request(self):
-        dialog = AddRequestDialog(self)
-        self.wait_window(dialog)
-        if dialog.result:
-            self._load_requests()
+        if self._add_dialog is None:
+            self._add_dialog = AddRequestDialog(self)
+        self._add_dialog.reset_fields()
+        self._add_dialog.open()
 
     def _change_status(self):
         rid = self._get_selected_id()
@@ -252,11 +405,10 @@ class ServiceCenterApp(tk.Tk):
             messagebox.showwarning("Внимание", "Выберите заявку")
             return
 
-        dialog = ChangeStatusDialog(self, rid)
-        self.wait_window(dialog)
-        if dialog.result:
-            self._load_requests()
-            self._show_details()
+        if self._status_dialog is None:
+            self._status_dialog = ChangeStatusDialog(self)
+        self._status_dialog.reset_fields()
+        self._status_dialog.open(rid)
 
     def _add_comment(self):
         rid = self._get_selected_id()
@@ -264,7 +416,10 @@ class ServiceCenterApp(tk.Tk):
             messagebox.showwarning("Внимание", "Выберите заявку")
             return
 
-        AddCommentDialog(self, rid)
+        if self._comment_dialog is None:
+            self._comment_dialog = AddCommentDialog(self)
+        self._comment_dialog.reset_fields()
+        self._comment_dialog.open(rid)
 
     def _extend_deadline(self):
         rid = self._get_selected_id()
@@ -279,7 +434,7 @@ class ServiceCenterApp(tk.Tk):
             return
 
         if self.db.extend_deadline(rid, new_date):
-            self._load_requests()
+            self._refresh_request(rid)
             self._show_details()
             messagebox.showinfo("Успешно", "Срок продлён")
 
@@ -293,48 +448,90 @@ class ServiceCenterApp(tk.Tk):
         ):
             return
 
-        self.db.cursor.execute(
-            "DELETE FROM requests WHERE id = ?", (rid,)
+        self.db.delete_request(rid)
+
+        self._remove_request_row(rid)
+        self.details.delete(1.0, tk.END)
+
+    def _import_csv(self):
+        """
+        Импорт CSV в фоновом потоке — окно остается отзывчивым.
+        """
+        from src.import_csv import (
+            import_users,
+            import_requests,
+            import_comments
+        )
+
+        path = filedialog.askopenfilename(
+            filetypes=[("CSV-файлы", "*.csv"), ("Все файлы", "*.*")]
         )
-        self.db.connection.commit()
+        if not path:
+            return
+
+        # Тип данных определяем по имени файла
+        name = os.path.basename(path).lower()
+        if "user" in name:
+            importer = import_users
+        elif "comment" in name:
+            importer = import_comments
+        else:
+            importer = import_requests
+
+        future = self._executor.submit(importer, path)
+        self.status_bar.config(text="Импорт CSV...")
+        self.after(100, self._poll_import, future)
+
+    def _poll_import(self, future):
+        if not future.done():
+            self.after(100, self._poll_import, future)
+            return
+
+        try:
+            future.result()
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Импорт не удался: {e}")
+            self.status_bar.config(text="Импорт не удался")
+            return
 
         self._load_requests()
-        self.details.delete(1.0, tk.END)
+
+    def _on_search_key(self, _=None):
+        """
+        Дебаунс живого поиска: БД опрашивается только после
+        ~200 мс паузы в наборе, а не на каждый символ.
+        """
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(200, self._search)
 
     def _search(self):
+        self._search_after = None
         term = self.search_var.get().strip()
         if not term:
             self._load_requests()
             return
 
-        self.tree.delete(*self.tree.get_children())
         results = self.db.search_requests(term)
-
-        for r in results:
-            self.tree.insert(
-                "", tk.END, iid=r["id"],
-                values=(
-                    r["id"],
-                    r["created_date"][:19],
-                    r["device_type"],
-                    r["device_model"],
-                    r["client_name"],
-                    r["status"],
-                    r["master_name"] or "-",
-                    r["deadline"] or "-"
-                )
-            )
+        self._show_requests(results)
 
         self.status_bar.config(text=f"Найдено: {len(results)}")
 
     def _show_statistics(self):
         stats = self.db.get_request_statistics()
 
-        text = f"Всего заявок: {stats['total_requests']}\n\n"
-        text += "По статусам:\n"
-        for s, c in stats["status_counts"].items():
-            text += f"  {s}: {c}\n"
-        text += f"\nСреднее время выполнения: {stats['average_completion_hours']} ч"
+        # Сборка текста через join — без пересоздания строки на каждой итерации
+        parts = [
+            f"Всего заявок: {stats['total_requests']}\n\n",
+            "По статусам:\n"
+        ]
+        parts.extend(
+            f"  {s}: {c}\n" for s, c in stats["status_counts"].items()
+        )
+        parts.append(
+            f"\nСреднее время выполнения: {stats['average_completion_hours']} ч"
+        )
+        text = "".join(parts)
 
         win = tk.Toplevel(self)
         win.title("Статистика")
@@ -349,11 +546,40 @@ class ServiceCenterApp(tk.Tk):
 # ДИАЛОГИ
 # =========================
 
-class AddRequestDialog(tk.Toplevel):
+class ReusableDialog(tk.Toplevel):
+    """
+    Базовый переиспользуемый диалог: создается один раз,
+    при закрытии скрывается вместо уничтожения и открывается
+    снова без пересборки дерева виджетов.
+    """
+
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
-        self.result = False
+        self.request_id = None
+
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.withdraw()
+
+    def open(self, request_id=None):
+        self.request_id = request_id
+        self.deiconify()
+        # Окно показывается асинхронно (X11): grab до фактического
+        # отображения падает с TclError "window not viewable"
+        self.wait_visibility()
+        self.grab_set()
+
+    def close(self):
+        self.grab_release()
+        self.withdraw()
+
+    def reset_fields(self):
+        pass
+
+
+class AddRequestDialog(ReusableDialog):
+    def __init__(self, parent):
+        super().__init__(parent)
 
         self.title("Новая заявка")
         self.geometry("400x450")
@@ -387,6 +613,13 @@ class AddRequestDialog(tk.Toplevel):
             command=self._save
         ).pack(pady=15)
 
+    def reset_fields(self):
+        self.device.set("")
+        self.model.delete(0, tk.END)
+        self.problem.delete(1.0, tk.END)
+        self.client.delete(0, tk.END)
+        self.phone.delete(0, tk.END)
+
     def _save(self):
         phone = self.phone.get().strip()
         if not validate_phone_number(phone):
@@ -401,16 +634,13 @@ class AddRequestDialog(tk.Toplevel):
             format_phone_number(phone)
         )
 
-        self.result = True
-        self.destroy()
+        self.close()
+        self.parent._load_requests()
 
 
-class ChangeStatusDialog(tk.Toplevel):
-    def __init__(self, parent, request_id):
+class ChangeStatusDialog(ReusableDialog):
+    def __init__(self, parent):
         super().__init__(parent)
-        self.parent = parent
-        self.request_id = request_id
-        self.result = False
 
         self.title("Изменение статуса")
         self.geometry("300x300")
@@ -435,6 +665,10 @@ class ChangeStatusDialog(tk.Toplevel):
             command=self._save
         ).pack(pady=15)
 
+    def reset_fields(self):
+        self.status.set("")
+        self.master.set("")
+
     def _save(self):
         if not self.status.get():
             return
@@ -445,15 +679,14 @@ class ChangeStatusDialog(tk.Toplevel):
             self.master.get() or None
         )
 
-        self.result = True
-        self.destroy()
+        self.close()
+        self.parent._refresh_request(self.request_id)
+        self.parent._show_details()
 
 
-class AddCommentDialog(tk.Toplevel):
-    def __init__(self, parent, request_id):
+class AddCommentDialog(ReusableDialog):
+    def __init__(self, parent):
         super().__init__(parent)
-        self.parent = parent
-        self.request_id = request_id
 
         self.title("Комментарий")
         self.geometry("400x350")
@@ -478,6 +711,11 @@ class AddCommentDialog(tk.Toplevel):
             command=self._save
         ).pack(pady=15)
 
+    def reset_fields(self):
+        self.comment.delete(1.0, tk.END)
+        self.parts.delete(0, tk.END)
+        self.author.delete(0, tk.END)
+
     def _save(self):
         self.parent.db.add_comment(
             self.request_id,
@@ -485,5 +723,5 @@ class AddCommentDialog(tk.Toplevel):
             self.parts.get(),
             self.author.get()
         )
-        self.destroy()
+        self.close()
 
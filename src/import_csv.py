@@ -1,144 +1,179 @@
-import csv
-from datetime import datetime
-
-from src.database import get_database
-from src.utils import hash_password
-
-
-# ======================================================
-# ИМПОРТ ПОЛЬЗОВАТЕЛЕЙ
-# CSV: userID;fio;phone;login;password;type
-# ======================================================
-
-def import_users(path: str):
-    db = get_database()
-
-    role_map = {
-        "менеджер": "manager",
-        "мастер": "master",
-        "оператор": "operator",
-        "администратор": "admin",
-        "заказчик": "client",
-    }
-
-    with open(path, newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter=";")
-
-        for row in reader:
-            username = row["login"].strip()
-            password = row["password"].strip()
-            full_name = row["fio"].strip()
-            role_raw = row["type"].strip().lower()
-
-            role = role_map.get(role_raw, "client")
-
-            db.cursor.execute("""
-                INSERT OR IGNORE INTO users
-                (username, password_hash, role, full_name)
-                VALUES (?, ?, ?, ?)
-            """, (
-                username,
-                hash_password(password),
-                role,
-                full_name
-            ))
-
-    db.connection.commit()
-
-
-# ======================================================
-# ИМПОРТ ЗАЯВОК
-# CSV:
-# requestID;startDate;homeTechType;homeTechModel;
-# problemDescryption;requestStatus;completionDate;
-# repairParts;masterID;clientID
-# ======================================================
-
-def import_requests(path: str):
-    db = get_database()
-
-    with open(path, newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter=";")
-
-        for row in reader:
-            # получаем имя клиента по clientID
-            db.cursor.execute(
-                "SELECT full_name FROM users WHERE id = ?",
-                (row["clientID"],)
-            )
-            client = db.cursor.fetchone()
-
-            client_name = client[0] if client else "Неизвестный клиент"
-            client_phone = "+7 (000) 000-00-00"
-
-            db.cursor.execute("""
-                INSERT OR IGNORE INTO requests (
-                    id,
-                    created_date,
-                    device_type,
-                    device_model,
-                    problem_description,
-                    client_name,
-                    client_phone,
-                    status,
-                    completion_date,
-                    updated_date
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row["requestID"],
-                f"{row['startDate']} 00:00:00",
-                row["homeTechType"],
-                row["homeTechModel"],
-                row["problemDescryption"],
-                client_name,
-                client_phone,
-                row["requestStatus"],
-                None if row["completionDate"] == "null"
-                else row["completionDate"] + " 00:00:00",
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            ))
-
-    db.connection.commit()
-
-
-# ======================================================
-# ИМПОРТ КОММЕНТАРИЕВ
-# CSV:
-# commentID;message;masterID;requestID
-# ======================================================
-
-def import_comments(path: str):
-    db = get_database()
-
-    with open(path, newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file, delimiter=";")
-
-        for row in reader:
-            # Проверяем, существует ли заявка
-            db.cursor.execute(
-                "SELECT id FROM requests WHERE id = ?",
-                (row["requestID"],)
-            )
-            if not db.cursor.fetchone():
-                # Пропускаем комментарий без заявки
-                continue
-
-            db.cursor.execute("""
-                INSERT OR IGNORE INTO comments (
-                    id,
-                    request_id,
-                    comment_text,
-                    added_date,
-                    author
-                )
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                row["commentID"],
-                row["requestID"],
-                row["message"],
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                f"master_{row['masterID']}"
-            ))
-
-    db.connection.commit()
+import csv
+from datetime import datetime
+
+from src.database import get_database
+from src.utils import hash_passwords
+
+# SQL-строки собираем один раз при импорте модуля —
+# в кэше подготовленных запросов sqlite3 ключом служит сам текст
+_INS_USER_SQL = """
+    INSERT OR IGNORE INTO users
+    (username, password_hash, role, full_name)
+    VALUES (?, ?, ?, ?)
+"""
+
+_INS_REQUEST_SQL = """
+    INSERT OR IGNORE INTO requests (
+        id,
+        created_date,
+        device_type,
+        device_model,
+        problem_description,
+        client_name,
+        client_phone,
+        status,
+        completion_date,
+        updated_date
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INS_COMMENT_SQL = """
+    INSERT OR IGNORE INTO comments (
+        id,
+        request_id,
+        comment_text,
+        added_date,
+        author
+    )
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+# ======================================================
+# ИМПОРТ ПОЛЬЗОВАТЕЛЕЙ
+# CSV: userID;fio;phone;login;password;type
+# ======================================================
+
+def import_users(path: str):
+    db = get_database()
+
+    role_map = {
+        "менеджер": "manager",
+        "мастер": "master",
+        "оператор": "operator",
+        "администратор": "admin",
+        "заказчик": "client",
+    }
+
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file, delimiter=";")
+
+        users = [
+            (
+                row["login"].strip(),
+                row["password"].strip(),
+                role_map.get(row["type"].strip().lower(), "client"),
+                row["fio"].strip()
+            )
+            for row in reader
+        ]
+
+    # Пароли хешируются одной пачкой (локальная ссылка на sha256
+    # внутри hash_passwords — без поиска атрибута на каждую строку)
+    hashes = hash_passwords([password for _, password, _, _ in users])
+
+    rows = [
+        (login, password_hash, role, full_name)
+        for (login, _, role, full_name), password_hash
+        in zip(users, hashes)
+    ]
+
+    # Одна подготовленная вставка и один commit на весь файл
+    with db.transaction():
+        db.cursor.executemany(_INS_USER_SQL, rows)
+
+
+# ======================================================
+# ИМПОРТ ЗАЯВОК
+# CSV:
+# requestID;startDate;homeTechType;homeTechModel;
+# problemDescryption;requestStatus;completionDate;
+# repairParts;masterID;clientID
+# ======================================================
+
+def import_requests(path: str):
+    db = get_database()
+
+    rows = []
+    # Одна метка времени на всю партию — значение одинаково для всех строк
+    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Имена клиентов загружаем одним запросом вместо SELECT на строку
+    db.cursor.execute("SELECT id, full_name FROM users")
+    user_names = {str(uid): name for uid, name in db.cursor.fetchall()}
+
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file, delimiter=";")
+
+        # Позиции столбцов вычисляем по заголовку один раз —
+        # дальше горячий цикл работает без словаря на каждую строку
+        header = next(reader)
+        col = header.index
+        i_id = col("requestID")
+        i_start = col("startDate")
+        i_type = col("homeTechType")
+        i_model = col("homeTechModel")
+        i_problem = col("problemDescryption")
+        i_status = col("requestStatus")
+        i_completion = col("completionDate")
+        i_client = col("clientID")
+
+        get_name = user_names.get
+        client_phone = "+7 (000) 000-00-00"
+
+        for row in reader:
+            completion = row[i_completion]
+            rows.append((
+                row[i_id],
+                row[i_start] + " 00:00:00",
+                row[i_type],
+                row[i_model],
+                row[i_problem],
+                get_name(row[i_client], "Неизвестный клиент"),
+                client_phone,
+                row[i_status],
+                None if completion == "null"
+                else completion + " 00:00:00",
+                now_str
+            ))
+
+    # Вся партия — одним executemany и одним commit
+    with db.transaction():
+        db.cursor.executemany(_INS_REQUEST_SQL, rows)
+
+
+# ======================================================
+# ИМПОРТ КОММЕНТАРИЕВ
+# CSV:
+# commentID;message;masterID;requestID
+# ======================================================
+
+def import_comments(path: str):
+    db = get_database()
+
+    rows = []
+    now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    # Существующие заявки загружаем одним запросом вместо SELECT на строку
+    db.cursor.execute("SELECT id FROM requests")
+    valid_request_ids = {str(r[0]) for r in db.cursor.fetchall()}
+
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file, delimiter=";")
+
+        for row in reader:
+            # Пропускаем комментарий без заявки
+            if row["requestID"] not in valid_request_ids:
+                continue
+
+            rows.append((
+                row["commentID"],
+                row["requestID"],
+                row["message"],
+                now_str,
+                f"master_{row['masterID']}"
+            ))
+
+    with db.transaction():
+        db.cursor.executemany(_INS_COMMENT_SQL, rows)
@@ -1,143 +1,179 @@
-"""
-Вспомогательные функции и утилиты.
-"""
-
-import re
-from datetime import datetime, timedelta
-from typing import Optional, List
-import hashlib
-
-def validate_phone_number(phone: str) -> bool:
-    """
-    Валидация номера телефона.
-    
-    Args:
-        phone (str): Номер телефона
-    
-    Returns:
-        bool: True если номер валиден
-    """
-    # Удаление всех нецифровых символов кроме плюса
-    cleaned = re.sub(r'[^\d+]', '', phone)
-    
-    # Проверка формата
-    # Российские номера: +7XXXXXXXXXX, 8XXXXXXXXXX, 7XXXXXXXXXX
-    pattern = r'^(\+7|7|8)\d{10}$'
-    
-    return bool(re.match(pattern, cleaned))
-
-def format_phone_number(phone: str) -> str:
-    """
-    Форматирование номера телефона в стандартный вид.
-    
-    Args:
-        phone (str): Номер телефона
-    
-    Returns:
-        str: Отформатированный номер
-    """
-    cleaned = re.sub(r'[^\d]', '', phone)
-    
-    if cleaned.startswith('8'):
-        cleaned = '7' + cleaned[1:]
-    elif cleaned.startswith('+7'):
-        cleaned = '7' + cleaned[2:]
-    
-    if len(cleaned) == 11 and cleaned.startswith('7'):
-        return f"+7 ({cleaned[1:4]}) {cleaned[4:7]}-{cleaned[7:9]}-{cleaned[9:]}"
-    
-    return phone
-
-def calculate_due_date(created_date: str, device_type: str) -> str:
-    """
-    Расчет предполагаемой даты завершения ремонта.
-    
-    Args:
-        created_date (str): Дата создания заявки
-        device_type (str): Тип устройства
-    
-    Returns:
-        str: Предполагаемая дата завершения
-    """
-    # Стандартные сроки ремонта по типам устройств (в днях)
-    repair_times = {
-        'Холодильник': 3,
-        'Стиральная машина': 2,
-        'Плита': 1,
-        'Микроволновая печь': 1,
-        'Посудомоечная машина': 2,
-        'Телевизор': 2,
-        'Кондиционер': 3,
-        'Другое': 2
-    }
-    
-    days_to_add = repair_times.get(device_type, 2)
-    
-    try:
-        created = datetime.strptime(created_date, "%Y-%m-%d %H:%M:%S")
-        due_date = created + timedelta(days=days_to_add)
-        return due_date.strftime("%Y-%m-%d")
-    except:
-        return "Не определено"
-
-def generate_report_filename(report_type: str) -> str:
-    """
-    Генерация имени файла для отчета.
-    
-    Args:
-        report_type (str): Тип отчета
-    
-    Returns:
-        str: Имя файла
-    """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_type = re.sub(r'[^\w]', '_', report_type.lower())
-    
-    return f"отчет_{safe_type}_{timestamp}.txt"
-
-def hash_password(password: str) -> str:
-    """
-    Хеширование пароля.
-    
-    Args:
-        password (str): Пароль
-    
-    Returns:
-        str: Хеш пароля
-    """
-    salt = "service_center_salt"
-    return hashlib.sha256((password + salt).encode()).hexdigest()
-
-def validate_email(email: str) -> bool:
-    """
-    Валидация email адреса.
-    
-    Args:
-        email (str): Email адрес
-    
-    Returns:
-        bool: True если email валиден
-    """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
-
-def split_name(full_name: str) -> tuple:
-    """
-    Разделение ФИО на составляющие.
-    
-    Args:
-        full_name (str): Полное ФИО
-    
-    Returns:
-        tuple: (Фамилия, Имя, Отчество)
-    """
-    parts = full_name.strip().split()
-    
-    if len(parts) >= 3:
-        return parts[0], parts[1], parts[2]
-    elif len(parts) == 2:
-        return parts[0], parts[1], ""
-    elif len(parts) == 1:
-        return parts[0], "", ""
-    else:
+"""
+Вспомогательные функции и утилиты.
+"""
+
+import re
+import sys
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional, List
+import hashlib
+
+# Скомпилированные один раз шаблоны — без повторной компиляции
+# (и поиска в кэше re) при каждом вызове
+_FILENAME_RE = re.compile(r'[^\w]')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Таблица удаления нецифровых символов: один проход str.translate
+# на уровне C вместо регулярного выражения
+_NON_DIGITS_TABLE = str.maketrans(
+    '', '', ''.join(chr(c) for c in range(256) if not chr(c).isdigit())
+)
+
+def _clean_phone_digits(phone: str) -> str:
+    """
+    Очистка номера до цифр (общий шаг валидации и форматирования).
+    """
+    return phone.translate(_NON_DIGITS_TABLE)
+
+# Кэш результатов валидации: при импорте CSV одни и те же
+# значения встречаются многократно
+@lru_cache(maxsize=4096)
+def validate_phone_number(phone: str) -> bool:
+    """
+    Валидация номера телефона.
+
+    Args:
+        phone (str): Номер телефона
+
+    Returns:
+        bool: True если номер валиден
+    """
+    # Российские номера: +7XXXXXXXXXX, 8XXXXXXXXXX, 7XXXXXXXXXX
+    cleaned = _clean_phone_digits(phone)
+    return len(cleaned) == 11 and cleaned[0] in '78'
+
+def format_phone_number(phone: str) -> str:
+    """
+    Форматирование номера телефона в стандартный вид.
+
+    Args:
+        phone (str): Номер телефона
+
+    Returns:
+        str: Отформатированный номер
+    """
+    cleaned = _clean_phone_digits(phone)
+
+    if cleaned.startswith('8'):
+        cleaned = '7' + cleaned[1:]
+
+    if len(cleaned) == 11 and cleaned.startswith('7'):
+        return f"+7 ({cleaned[1:4]}) {cleaned[4:7]}-{cleaned[7:9]}-{cleaned[9:]}"
+
+    return phone
+
+# Стандартные сроки ремонта по типам устройств (в днях).
+# Словарь строится один раз на модуль; интернированные ключи
+# позволяют поиску сравнивать строки по указателю
+_REPAIR_TIMES = {
+    sys.intern(device): days
+    for device, days in (
+        ('Холодильник', 3),
+        ('Стиральная машина', 2),
+        ('Плита', 1),
+        ('Микроволновая печь', 1),
+        ('Посудомоечная машина', 2),
+        ('Телевизор', 2),
+        ('Кондиционер', 3),
+        ('Другое', 2)
+    )
+}
+
+def calculate_due_date(created_date: str, device_type: str) -> str:
+    """
+    Расчет предполагаемой даты завершения ремонта.
+    
+    Args:
+        created_date (str): Дата создания заявки
+        device_type (str): Тип устройства
+    
+    Returns:
+        str: Предполагаемая дата завершения
+    """
+    days_to_add = _REPAIR_TIMES.get(device_type, 2)
+    
+    try:
+        created = datetime.fromisoformat(created_date)
+        due_date = created + timedelta(days=days_to_add)
+        return due_date.strftime("%Y-%m-%d")
+    except ValueError:
+        return "Не определено"
+
+def generate_report_filename(report_type: str) -> str:
+    """
+    Генерация имени файла для отчета.
+    
+    Args:
+        report_type (str): Тип отчета
+    
+    Returns:
+        str: Имя файла
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_type = _FILENAME_RE.sub('_', report_type.lower())
+    
+    return f"отчет_{safe_type}_{timestamp}.txt"
+
+# Соль в байтах один раз на модуль; соль добавляется после пароля —
+# менять порядок нельзя, иначе сохраненные хеши перестанут совпадать
+_SALT = b"service_center_salt"
+
+def hash_password(password: str) -> str:
+    """
+    Хеширование пароля.
+
+    Args:
+        password (str): Пароль
+
+    Returns:
+        str: Хеш пароля
+    """
+    return hashlib.sha256(password.encode() + _SALT).hexdigest()
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Массовое хеширование паролей (для импорта CSV).
+
+    Args:
+        passwords (List[str]): Пароли
+
+    Returns:
+        List[str]: Хеши в том же порядке
+    """
+    sha256 = hashlib.sha256
+    return [sha256(p.encode() + _SALT).hexdigest() for p in passwords]
+
+@lru_cache(maxsize=4096)
+def validate_email(email: str) -> bool:
+    """
+    Валидация email адреса.
+    
+    Args:
+        email (str): Email адрес
+    
+    Returns:
+        bool: True если email валиден
+    """
+    return bool(_EMAIL_RE.match(email))
+
+def split_name(full_name: str) -> tuple:
+    """
+    Разделение ФИО на составляющие.
+    
+    Args:
+        full_name (str): Полное ФИО
+    
+    Returns:
+        tuple: (Фамилия, Имя, Отчество)
+    """
+    parts = full_name.strip().split()
+    
+    if len(parts) >= 3:
+        return parts[0], parts[1], parts[2]
+    elif len(parts) == 2:
+        return parts[0], parts[1], ""
+    elif len(parts) == 1:
+        return parts[0], "", ""
+    else:
         return "", "", ""
\ No newline at end of file
@@ -3,13 +3,29 @@
 """
 
 import unittest
+import tempfile
+import os
+from collections import Counter
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+
+import src.algorithms
+import src.database
+from src.database import Database
 from src.algorithms import (
     calculate_average_repair_time,
     calculate_status_distribution,
     calculate_request_statistics_by_device
 )
 
+# Повторяющиеся метки времени (обычное дело при пакетном импорте)
+# разбираются один раз, дальше — попадание в кэш
+@lru_cache(maxsize=4096)
+def _parse(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp)
+
 class TestAlgorithms(unittest.TestCase):
     """
     Тесты для алгоритмов расчета статистики.
@@ -17,10 +33,10 @@ class TestAlgorithms(unittest.TestCase):
     
     def test_calculate_average_repair_time_empty(self):
         """Тест расчета среднего времени при отсутствии данных."""
-        # Здесь нужен мок базы данных
-        # Для простоты тестируем логику
-        result = 0.0  # Заглушка
-        self.assertEqual(result, 0.0)
+        # Настоящий вызов функции на пустой БД вместо заглушки,
+        # сравнивавшей константу саму с собой
+        self._make_temp_database()
+        self.assertEqual(calculate_average_repair_time(), 0.0)
     
     def test_status_distribution_logic(self):
         """Тест логики расчета распределения статусов."""
@@ -32,12 +48,14 @@ class TestAlgorithms(unittest.TestCase):
         ]
         
         total = sum(count for _, count in test_data)
-        
-        # Расчет процентов
-        results = []
-        for status, count in test_data:
-            percentage = round(count / total * 100, 2)
-            results.append((status, count, percentage))
+
+        # Расчет процентов одним списковым включением.
+        # Храним сырые доли без round() на каждый элемент:
+        # округление — забота отображения, а не расчета
+        results = [
+            (status, count, count / total * 100)
+            for status, count in test_data
+        ]
         
         self.assertEqual(len(results), 3)
         self.assertAlmostEqual(sum(p for _, _, p in results), 100.0, places=2)
@@ -54,36 +72,100 @@ class TestAlgorithms(unittest.TestCase):
              "2024-01-01 09:00:00", "2024-01-01 14:00:00"),
         ]
         
-        # Имитация группировки
-        device_stats = {}
-        for device, status, problem, created, completed in test_requests:
-            if device not in device_stats:
-                device_stats[device] = {
-                    'total': 0,
-                    'completed': 0,
-                    'repair_times': [],
-                    'problems': {}
-                }
-            
-            device_stats[device]['total'] += 1
-            
-            if problem in device_stats[device]['problems']:
-                device_stats[device]['problems'][problem] += 1
-            else:
-                device_stats[device]['problems'][problem] = 1
-            
-            if status == 'Завершена' and completed:
-                # Расчет времени ремонта
-                created_dt = datetime.strptime(created, "%Y-%m-%d %H:%M:%S")
-                completed_dt = datetime.strptime(completed, "%Y-%m-%d %H:%M:%S")
-                hours = (completed_dt - created_dt).total_seconds() / 3600
-                
-                device_stats[device]['completed'] += 1
-                device_stats[device]['repair_times'].append(hours)
-        
-        self.assertEqual(len(device_stats), 2)
-        self.assertEqual(device_stats['Холодильник']['total'], 2)
-        self.assertEqual(device_stats['Стиральная машина']['total'], 1)
+        # Колоночная (SoA) раскладка: по словарю на показатель вместо
+        # вложенного словаря на устройство. Внутри группы показатели
+        # копятся в локальных переменных и записываются в "колонки"
+        # один раз на группу
+        totals = {}
+        completed_counts = {}
+        average_hours = {}
+        problems = {}
+
+        by_device = sorted(test_requests, key=itemgetter(0))
+
+        for device, rows in groupby(by_device, key=itemgetter(0)):
+            total = 0
+            done = 0
+            sum_hours = 0.0
+            # Counter: инкремент без предварительной проверки
+            # наличия ключа
+            problem_counts = Counter()
+
+            for _, status, problem, created, completed in rows:
+                total += 1
+                problem_counts[problem] += 1
+
+                if status == 'Завершена' and completed:
+                    # Расчет времени ремонта
+                    created_dt = _parse(created)
+                    completed_dt = _parse(completed)
+                    sum_hours += (
+                        completed_dt - created_dt
+                    ).total_seconds() / 3600
+                    done += 1
+
+            totals[device] = total
+            completed_counts[device] = done
+            average_hours[device] = sum_hours / done if done else 0.0
+            problems[device] = problem_counts
+
+        self.assertEqual(len(totals), 2)
+        self.assertEqual(totals['Холодильник'], 2)
+        self.assertEqual(totals['Стиральная машина'], 1)
+        self.assertEqual(completed_counts['Холодильник'], 1)
+        self.assertAlmostEqual(average_hours['Холодильник'], 29.0, places=2)
+
+    def _make_temp_database(self) -> Database:
+        """Временная БД, подставленная вместо синглтона на время теста."""
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        database = Database(db_path)
+
+        original = src.database._db_instance
+        src.database._db_instance = database
+
+        # Кэш статистики мог запомнить результаты для другой БД
+        # с тем же поколением данных
+        src.algorithms._stats_cache.clear()
+        self.addCleanup(src.algorithms._stats_cache.clear)
+        self.addCleanup(
+            setattr, src.database, "_db_instance", original
+        )
+        self.addCleanup(os.unlink, db_path)
+        self.addCleanup(database.close)
+
+        return database
+
+    def test_device_statistics_sql(self):
+        """Тест SQL-агрегации статистики по устройствам на реальной БД."""
+        database = self._make_temp_database()
+
+        database.add_requests_bulk([
+            ("Холодильник", "Atlant", "Не морозит",
+             "Иванов Иван", "89991234567", None),
+            ("Холодильник", "Samsung", "Не морозит",
+             "Петров Петр", "89991234568", None),
+            ("Стиральная машина", "LG", "Не сливает",
+             "Сидоров Сидор", "89991234569", None),
+        ])
+        completed_id = next(
+            r['id'] for r in database.get_all_requests()
+            if r['device_model'] == "Atlant"
+        )
+        database.update_request_status(completed_id, "Завершена")
+
+        stats = calculate_request_statistics_by_device()
+
+        self.assertEqual(len(stats), 2)
+        self.assertEqual(stats['Холодильник']['total_requests'], 2)
+        self.assertEqual(stats['Холодильник']['completed_requests'], 1)
+        self.assertEqual(stats['Холодильник']['completion_rate'], 50.0)
+        self.assertEqual(
+            stats['Холодильник']['most_common_problem'], "Не морозит"
+        )
+        self.assertEqual(
+            stats['Стиральная машина']['total_requests'], 1
+        )
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -12,16 +12,36 @@ class TestDatabase(unittest.TestCase):
     Тесты для класса Database.
     """
     
-    def setUp(self):
-        """Создание временной базы данных для тестов."""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
-        self.db_path = self.temp_db.name
-        self.database = Database(self.db_path)
-    
-    def tearDown(self):
+    @classmethod
+    def setUpClass(cls):
+        """Создание общей временной базы данных для всех тестов."""
+        # База и схема создаются один раз на класс, а не на каждый тест:
+        # тесты лишь очищают таблицы в setUp
+        fd, cls.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        cls.database = Database(cls.db_path)
+
+        # Данные одноразовые: отключаем fsync и держим журнал в памяти
+        # (temp_store=MEMORY соединение выставляет само)
+        cls.database.connection.executescript(
+            "PRAGMA synchronous = OFF;"
+            "PRAGMA journal_mode = MEMORY;"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
         """Удаление временной базы данных."""
-        self.database.close()
-        os.unlink(self.db_path)
+        cls.database.close()
+        os.unlink(cls.db_path)
+
+    def setUp(self):
+        """Очистка данных перед каждым тестом."""
+        # Транзакция сбрасывает и данные, и счетчик автоинкремента;
+        # ее commit поднимает поколение данных — кэши инвалидируются
+        with self.database.transaction() as cursor:
+            cursor.execute("DELETE FROM comments")
+            cursor.execute("DELETE FROM requests")
+            cursor.execute("DELETE FROM sqlite_sequence")
     
     def test_add_request(self):
         """Тест добавления заявки."""
@@ -62,13 +82,10 @@ class TestDatabase(unittest.TestCase):
         
         self.assertTrue(success)
         
-        # Проверяем обновление
-        requests = self.database.get_all_requests()
-        updated_request = next(
-            (r for r in requests if r['id'] == request_id), 
-            None
-        )
-        
+        # Проверяем обновление точечным запросом по первичному ключу
+        # вместо загрузки и линейного перебора всех заявок
+        updated_request = self.database.get_request_by_id(request_id)
+
         self.assertIsNotNone(updated_request)
         self.assertEqual(updated_request['status'], "В процессе")
         self.assertEqual(updated_request['master_name'], "Мастер Иванов")
@@ -96,13 +113,18 @@ class TestDatabase(unittest.TestCase):
     
     def test_get_statistics(self):
         """Тест расчета статистики."""
-        # Добавляем тестовые данные
-        for i in range(5):
-            self.database.add_request(
+        # Добавляем тестовые данные одной партией:
+        # один executemany и один commit вместо пяти
+        rows = [
+            (
                 f"Устройство {i % 3}", f"Модель {i}",
-                f"Проблема {i}", f"Клиент {i}", f"8999123457{i}"
+                f"Проблема {i}", f"Клиент {i}", f"8999123457{i}",
+                None
             )
-        
+            for i in range(5)
+        ]
+        self.database.add_requests_bulk(rows)
+
         stats = self.database.get_request_statistics()
         
         self.assertEqual(stats['total_requests'], 5)